@@ -1,4 +1,5 @@
 from pynamodb_polymorph.custom_attr import (
+    CachedComputedAttributes,
     CompoundTemplateAttribute,
     CopiedDiscriminatorAttribute,
     CopiedIntegerAttribute,
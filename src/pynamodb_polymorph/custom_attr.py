@@ -1,3 +1,7 @@
+import copy
+import inspect
+import string
+import sys
 import typing as t
 from datetime import datetime, timezone
 from string import Template
@@ -6,14 +10,112 @@ import urllib.parse
 import ulid
 from pynamodb.attributes import NumberAttribute, UnicodeAttribute
 
+try:
+    # C-implemented ISO 8601 parser, several times faster than the stdlib. Non-UTC offsets come
+    # back as a `ciso8601.FixedOffset` tzinfo rather than `datetime.timezone`
+    from ciso8601 import parse_datetime as _parse_isoformat
+except ImportError:  # pragma: no cover
+    _parse_isoformat = datetime.fromisoformat
 
-class CompoundTemplateAttribute(UnicodeAttribute):
+
+# Mirrors urllib.parse.quote with its default safe="/" for ASCII input
+_QUOTE_SAFE = frozenset(string.ascii_letters + string.digits + "_.-~/")
+_QUOTE_TABLE = {b: f"%{b:02X}" for b in range(128) if chr(b) not in _QUOTE_SAFE}
+
+
+def _quote(value: str) -> str:
+    """urllib.parse.quote, with a single str.translate pass for ASCII strings"""
+    if value.isascii():
+        return value.translate(_QUOTE_TABLE)
+    return urllib.parse.quote(value)
+
+
+def _split_names(names: t.Union[str, t.Iterable[str]]) -> t.Tuple[str, ...]:
+    """Normalize a list or comma-separated string of attribute names to a tuple of interned names"""
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(",")]
+    return tuple(sys.intern(name) for name in names)
+
+
+_CACHE = "_computed_attr_cache"
+
+
+class _ComputedAttribute:
+    """Marker base for attributes derived from other attributes, which `CachedComputedAttributes` can memoize"""
+
+    __slots__ = ()
+
+
+class _CachedGet:
+    """Descriptor mixin that memoizes the wrapped attribute's `__get__` in the instance's cache dict"""
+
+    __slots__ = ()
+
+    def __get__(self, obj, type_):
+        if obj is None:
+            return self
+        cache = obj.__dict__.get(_CACHE)
+        if cache is None:
+            cache = obj.__dict__[_CACHE] = {}
+        key = self.attr_name
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = super().__get__(obj, type_)
+            return value
+
+
+_cached_types: t.Dict[type, type] = {}
+
+
+def _cached_copy(attr):
+    """Copy of `attr` with a class whose reads go through `_CachedGet`"""
+    cls = type(attr)
+    if cls not in _cached_types:
+        _cached_types[cls] = type(
+            f"Cached{cls.__name__}",
+            (_CachedGet, cls),
+            {"__slots__": (), "__doc__": cls.__doc__, "__module__": cls.__module__},
+        )
+    cached = copy.copy(attr)
+    cached.__class__ = _cached_types[cls]
+    cached.attr_path = list(attr.attr_path)
+    return cached
+
+
+class CachedComputedAttributes:
+    """Model mixin that memoizes computed attributes (templates, joins, copies) per instance.
+
+    `class Base(CachedComputedAttributes, Model): ...`
+
+    The cache is cleared whenever any attribute is assigned on the model. In-place mutation of a
+    source value (e.g. `model.items.add("x")`) is not detected, reassign the attribute instead.
+    Writing to `model.attribute_values` directly also bypasses invalidation.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Swap in caching copies on this class only, so models without the mixin keep the plain reads
+        for name in dir(cls):
+            attr = inspect.getattr_static(cls, name)
+            if isinstance(attr, _ComputedAttribute) and not isinstance(attr, _CachedGet):
+                setattr(cls, name, _cached_copy(attr))
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        if cache := self.__dict__.get(_CACHE):
+            cache.clear()
+
+
+class CompoundTemplateAttribute(_ComputedAttribute, UnicodeAttribute):
     """Creates a compound STRING attribute out of multiple other attributes from the same model.
 
     template: A string.Template or a str formatted as a string.Template
     attrs: A list of attribute names to be used in the template string
     """
 
+    __slots__ = ("attrs", "template", "_parts", "_render")
+
     def __init__(
         self,
         *args,
@@ -21,21 +123,63 @@ class CompoundTemplateAttribute(UnicodeAttribute):
         attrs: t.List[str],
         **kwargs,
     ):
-        self.attrs = attrs
+        self.attrs = _split_names(attrs)
         self.template = (
             template if isinstance(template, Template) else Template(template)
         )
+        self._parts = self._compile(self.template, self.attrs)
+        self._render = self._codegen(self._parts, self.attrs)
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    def _compile(template: Template, attrs: t.Sequence[str]) -> t.List[t.Union[str, int]]:
+        """Split `template` once into literal runs (str) and indexes into `attrs` (int)"""
+        parts: t.List[t.Union[str, int]] = []
+        literal = []
+        pos = 0
+        for match in template.pattern.finditer(template.template):
+            literal.append(template.template[pos : match.start()])
+            pos = match.end()
+            if match.group("escaped") is not None:
+                literal.append(template.delimiter)
+                continue
+            name = match.group("named") or match.group("braced")
+            if name is None:
+                raise ValueError(f"Invalid placeholder in template: {template.template!r}")
+            if name not in attrs:
+                raise ValueError(f"Template placeholder {name!r} is not listed in attrs")
+            if "".join(literal):
+                parts.append("".join(literal))
+            literal = []
+            parts.append(attrs.index(name))
+        literal.append(template.template[pos:])
+        if "".join(literal):
+            parts.append("".join(literal))
+        return parts
+
+    @staticmethod
+    def _codegen(parts: t.List[t.Union[str, int]], attrs: t.Sequence[str]) -> t.Callable[[t.Any], str]:
+        """Generate a function that renders `parts` for an object in a single expression"""
+        used = [p for p in parts if isinstance(p, int)]
+        if len(used) == len(set(used)):
+            terms = [repr(p) if isinstance(p, str) else f"_str(_getattr(obj, {attrs[p]!r}))" for p in parts]
+            body = ""
+        else:
+            # Placeholders repeat, so read each attr once up front
+            terms = [repr(p) if isinstance(p, str) else f"v{p}" for p in parts]
+            body = "".join(f"    v{i} = _str(_getattr(obj, {attrs[i]!r}))\n" for i in sorted(set(used)))
+        source = f"def _render(obj, _str=str, _getattr=getattr):\n{body}    return {' + '.join(terms) or repr('')}\n"
+        namespace: t.Dict[str, t.Any] = {}
+        exec(source, {}, namespace)
+        return namespace["_render"]
+
     def __get__(self, obj, type_):
         if not obj:
             return self
-        return self.template.substitute(
-            {x: getattr(obj, x) for x in self.attrs},
-        )
+        return self._render(obj)
 
 
-class JoinedUnicodeAttribute(UnicodeAttribute):
+class JoinedUnicodeAttribute(_ComputedAttribute, UnicodeAttribute):
     """Compound STRING attribute built by joining attributes `attrs` with a chosen separator `sep`.
 
     `JoinedAttribute(attrs=['org_id', 'user_id'], sep='|') # makes the key `123|456` for org_id=123,user_id=456`
@@ -44,6 +188,8 @@ class JoinedUnicodeAttribute(UnicodeAttribute):
     sep: A non-empty string to join together
     """
 
+    __slots__ = ("attrs", "sep", "_sep_join", "_single", "_attr0")
+
     def __init__(
         self,
         *args,
@@ -52,18 +198,21 @@ class JoinedUnicodeAttribute(UnicodeAttribute):
         **kwargs,
     ):
 
-        self.attrs = (
-            tuple(attrs)
-            if isinstance(attrs, (list, tuple, set))
-            else tuple(i.strip() for i in attrs.split(","))
-        )
+        self.attrs = _split_names(attrs)
         self.sep = sep
+        self._sep_join = sep.join
+        # A single attr has nothing to join, so reads can skip straight to str()
+        self._single = len(self.attrs) == 1
+        self._attr0 = self.attrs[0] if self._single else None
         super().__init__(*args, **kwargs)
 
     def __get__(self, obj, type_):
         if obj is None:
             return self
-        return self.sep.join(str(getattr(obj, x)) for x in self.attrs)
+        if self._single:
+            return str(getattr(obj, self._attr0))
+        # A list comprehension is cheaper than a generator for the handful of attrs in a key
+        return self._sep_join([str(getattr(obj, x)) for x in self.attrs])
 
 
 class EscapedJoinedUnicodeAttribute(JoinedUnicodeAttribute):
@@ -81,6 +230,8 @@ class EscapedJoinedUnicodeAttribute(JoinedUnicodeAttribute):
             If no attributes are supplied, all attributes are escaped
     """
 
+    __slots__ = ("escaped", "_escaped_set")
+
     def __init__(
         self,
         *args,
@@ -91,22 +242,20 @@ class EscapedJoinedUnicodeAttribute(JoinedUnicodeAttribute):
     ):
         self.escaped = None
         if escaped:
-            self.escaped = (
-                tuple(escaped)
-                if isinstance(escaped, (list, tuple, set))
-                else tuple(i.strip() for i in escaped.split(","))
-            )
+            self.escaped = _split_names(escaped)
+        self._escaped_set = frozenset(self.escaped) if self.escaped else None
         super().__init__(*args, attrs=attrs, sep=sep, **kwargs)
 
-    def __get__(self, obj, type_):
-        def escape_string(attr, value):
-            if not self.escaped or attr in self.escaped:
-                return urllib.parse.quote(value)
-            return value
+    _quote = staticmethod(_quote)
 
+    def __get__(self, obj, type_):
         if obj is None:
             return self
-        return self.sep.join(escape_string(x, str(getattr(obj, x))) for x in self.attrs)
+        esc = self._escaped_set
+        quote = self._quote
+        return self._sep_join(
+            [quote(str(getattr(obj, x))) if esc is None or x in esc else str(getattr(obj, x)) for x in self.attrs]
+        )
 
 
 class ULIDAttribute(UnicodeAttribute):
@@ -131,7 +280,15 @@ class IsoDateTime(UnicodeAttribute):
         return value.isoformat()
 
     def deserialize(self, value):
-        return datetime.fromisoformat(value)
+        try:
+            return _parse_isoformat(value)
+        except ValueError:
+            # ciso8601 rejects some valid isoformat() output, such as offsets with seconds
+            return datetime.fromisoformat(value)
+
+
+def _utcnow(_now=datetime.now, _tz=timezone.utc) -> datetime:
+    return _now(_tz)
 
 
 class UpdatedIsoDateTime(IsoDateTime):
@@ -145,22 +302,36 @@ class UpdatedIsoDateTime(IsoDateTime):
         super().__init__(
             *args,
             # Typing override because our parent class already has a serde for datetime -> str
-            default=t.cast(t.Callable[[], str], lambda: datetime.now(tz=timezone.utc)),
+            default=t.cast(t.Callable[[], str], _utcnow),
             **kwargs,
         )
 
 
-class SetSizeAttribute(NumberAttribute):
+class _SourcedAttribute:
+    """Descriptor mixin for attributes that read the value of another attribute named `source`"""
+
+    __slots__ = ("source",)
+
     def __init__(
         self,
         *args,
         source: str,
         **kwargs,
     ):
-        self.source = source
+        self.source = sys.intern(source)
         super().__init__(*args, **kwargs)
 
+
+class SetSizeAttribute(_SourcedAttribute, NumberAttribute):
+    """The number of items in the set attribute `source`.
+
+    Not memoized by `CachedComputedAttributes`, since sets are commonly mutated in place."""
+
+    __slots__ = ()
+
     def __get__(self, obj, type_):
+        if obj is None:
+            return self
         return len(getattr(obj, self.source))
 
 
@@ -169,15 +340,8 @@ def copied_attr_factory(attr_type):
 
     Takes any primitive PynamoDB attribute (binary, string, numeric, etc) and copies it under a new name."""
 
-    class CopiedAttribute(attr_type):
-        def __init__(
-            self,
-            *args,
-            source: str,
-            **kwargs,
-        ):
-            self.source = source
-            super().__init__(*args, **kwargs)
+    class CopiedAttribute(_ComputedAttribute, _SourcedAttribute, attr_type):
+        __slots__ = ()
 
         def __get__(self, obj, type_):
             if obj is None:
@@ -196,19 +360,38 @@ class CopiedIntegerAttribute(copied_attr_factory(NumberAttribute)):
     Always coerces values to integer at serialize/deserialize time
     """
 
+    __slots__ = ()
+
     def serialize(self, value):
-        return super().serialize(int(value))
+        # str() of an int is exactly what json.dumps would produce, minus the encoder setup
+        return str(value if type(value) is int else int(value))
 
     def deserialize(self, value):
-        return int(super().deserialize(value))
+        try:
+            return int(value)
+        except ValueError:
+            # Stored as a non-integer number such as "1.5" or "1e3"
+            return int(super().deserialize(value))
 
 
 class CopiedDiscriminatorAttribute(copied_attr_factory(UnicodeAttribute)):
     """Special case of CopiedUnicodeAttribute to cover discriminators"""
 
+    __slots__ = ("_disc_cache",)
+
+    def __init__(self, *args, **kwargs):
+        # Model class -> discriminator value, stable once the class is registered
+        self._disc_cache: t.Dict[type, t.Any] = {}
+        super().__init__(*args, **kwargs)
+
     def serialize(self, value):
+        try:
+            return self._disc_cache[value]
+        except KeyError:
+            pass
         if disc := getattr(value, value._discriminator, None):
-            return disc._class_map[value]
+            self._disc_cache[value] = disc._class_map[value]
+            return self._disc_cache[value]
         return None
 
 
@@ -1,25 +1,95 @@
 import base64
+import sys
+import threading
 import zlib
 
 from pynamodb.attributes import Attribute
 from pynamodb.constants import BINARY
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# zstandard contexts are not thread safe, so each thread keeps its own, shared across attributes
+_zstd_contexts = threading.local()
+
+
+def _zstd_compressor(level: int) -> "zstandard.ZstdCompressor":
+    if not hasattr(_zstd_contexts, "compressors"):
+        _zstd_contexts.compressors = {}
+    compressors = _zstd_contexts.compressors
+    if level not in compressors:
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level]
+
+
+def _zstd_decompressor() -> "zstandard.ZstdDecompressor":
+    if not hasattr(_zstd_contexts, "decompressor"):
+        _zstd_contexts.decompressor = zstandard.ZstdDecompressor()
+    return _zstd_contexts.decompressor
+
+
+# zlib.compress only accepts wbits from Python 3.11
+_COMPRESS_TAKES_WBITS = sys.version_info >= (3, 11)
+_DECOMPRESS_ERRORS = (zlib.error,) if zstandard is None else (zlib.error, zstandard.ZstdError)
+
 
 class CompressedAttribute(Attribute[bytes]):
     """
     A zlib-compressed binary attribute
+
+    level: zlib compression level, lower is faster at the cost of a larger payload
+    wbits: zlib window size, must match between writes and reads
+    use_zstd: compress with zstandard (requires the `zstd` extra) instead of zlib.
+            Not compatible with values already stored using zlib
     """
 
     attr_type = BINARY
 
-    def serialize(self, value: str) -> str:
+    def __init__(
+        self,
+        *args,
+        level: int = 6,
+        wbits: int = zlib.MAX_WBITS,
+        use_zstd: bool = False,
+        **kwargs,
+    ):
+        self.level = level
+        self.wbits = wbits
+        self.use_zstd = use_zstd
+        if use_zstd and zstandard is None:
+            raise ImportError("use_zstd=True requires the zstandard package")
+        super().__init__(*args, **kwargs)
+
+    def _compress(self, value: bytes) -> bytes:
+        if self.use_zstd:
+            return _zstd_compressor(self.level).compress(value)
+        if self.wbits == zlib.MAX_WBITS:
+            return zlib.compress(value, self.level)
+        if _COMPRESS_TAKES_WBITS:
+            return zlib.compress(value, self.level, self.wbits)
+        # A compressobj costs more to set up than compressing a small value, so only use it when we must
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, self.wbits)
+        return compressor.compress(value) + compressor.flush()
+
+    def _decompress(self, value: bytes) -> bytes:
+        if self.use_zstd:
+            return _zstd_decompressor().decompress(value)
+        return zlib.decompress(value, self.wbits)
+
+    def serialize(self, value: str) -> bytes:
         """
         Returns the compressed binary of the value
         """
-        return base64.b64encode(zlib.compress(value.encode("utf-8"))).decode("utf-8")
+        return self._compress(value.encode("utf-8"))
 
     def deserialize(self, value: bytes) -> str:
         """
-        Returns a decoded byte string from a base64 encoded value
+        Returns the decompressed string from a compressed binary value
         """
-        return zlib.decompress(base64.b64decode(value)).decode("utf-8")
+        try:
+            return self._decompress(value).decode("utf-8")
+        except _DECOMPRESS_ERRORS:
+            # Values written by older releases were base64 encoded, default zlib
+            return zlib.decompress(base64.b64decode(value)).decode("utf-8")
@@ -11,6 +11,7 @@ from pynamodb.attributes import (
 from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 from pynamodb.models import Model
 from pynamodb_polymorph import (
+    CachedComputedAttributes,
     CompoundTemplateAttribute,
     CopiedDiscriminatorAttribute,
     CopiedIntegerAttribute,
@@ -153,3 +154,9 @@ class Order(Base, discriminator="Order"):
         attrs=["size"],
     )
     gsi2_sk = CopiedIntegerAttribute(source="ulid")
+
+
+class CachedPublisher(CachedComputedAttributes, Base, discriminator="CachedPublisher"):
+    name = UnicodeAttribute()
+    gsi1_pk = CopiedDiscriminatorAttribute(source="cls")
+    gsi1_sk = JoinedUnicodeAttribute(attrs="type_,name")
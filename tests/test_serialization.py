@@ -1,6 +1,10 @@
+import base64
 import timeit
 import urllib.parse
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from string import Template
 from textwrap import dedent
 
 import pytest
@@ -8,6 +12,7 @@ import ulid
 from faker import Faker
 
 import models
+from pynamodb_polymorph import CompoundTemplateAttribute, CompressedAttribute, CopiedIntegerAttribute, IsoDateTime
 
 
 def test_compound_key_from_discriminator():
@@ -36,6 +41,24 @@ def test_item_calculated():
     assert "BAR#Fizz#Buzz!" == b.compound
 
 
+@pytest.mark.parametrize(
+    "template",
+    ["PLAIN", "$$${a}#$b$$", "${a}${b}", "'quoted\\' \"{a}\" $a", "", "$a-$b-$a"],
+)
+def test_compound_template_matches_substitute(template):
+    class Source:
+        a = 1
+        b = "two"
+
+    attr = CompoundTemplateAttribute(template=template, attrs=["a", "b"])
+    assert attr.__get__(Source(), Source) == Template(template).substitute(a=1, b="two")
+
+
+def test_compound_template_rejects_unknown_placeholder():
+    with pytest.raises(ValueError):
+        CompoundTemplateAttribute(template="$a#$missing", attrs=["a"])
+
+
 def test_foo():
     f = models.FooModel(foo="hello")
     print(f.serialize())
@@ -58,6 +81,28 @@ def test_joined_attr():
     assert f.serialize()["gsi1_pk"]["S"] == "REVIEW#someone@test.com"
 
 
+def test_cached_computed_attrs_invalidate_on_set():
+    f = models.CachedPublisher(name="RyanSB")
+    assert f.gsi1_sk == "CACHEDPUBLISHER#RyanSB"
+    assert f.__dict__["_computed_attr_cache"]["gsi1_sk"] == "CACHEDPUBLISHER#RyanSB"
+    assert f.serialize()["gsi1_sk"]["S"] == "CACHEDPUBLISHER#RyanSB"
+    f.name = "Other"
+    assert f.gsi1_sk == "CACHEDPUBLISHER#Other"
+    f.deserialize({"name": {"S": "Loaded"}})
+    assert f.gsi1_sk == "CACHEDPUBLISHER#Loaded"
+    assert type(models.CachedPublisher.gsi1_sk).__name__ == "CachedJoinedUnicodeAttribute"
+    # Models without the mixin share no caching descriptors with cached ones
+    assert "_computed_attr_cache" not in models.Publisher(name="RyanSB").__dict__
+
+
+def test_set_size_tracks_in_place_mutation():
+    f = models.Order(email="someone@test.com", items={"a", "b"})
+    assert f.size == 2
+    f.items.add("c")
+    assert f.serialize()["size"]["N"] == "3"
+    assert f.serialize()["gsi2_pk"]["S"] == "BYSIZE#3"
+
+
 def test_escaped_joined_attr():
     invited_email = "helloworld@example.com"
     inviter_email = "other@example.com"
@@ -78,6 +123,85 @@ def test_escaped_joined_attr():
     )
 
 
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"level": 1}, {"level": 9, "wbits": -15}, {"use_zstd": True, "level": 3}],
+)
+def test_compressed_roundtrip(kwargs):
+    if kwargs.get("use_zstd"):
+        pytest.importorskip("zstandard")
+    attr = CompressedAttribute(**kwargs)
+    text = "hello world " * 100
+    assert attr.deserialize(attr.serialize(text)) == text
+
+
+def test_compressed_zstd_is_thread_safe():
+    pytest.importorskip("zstandard")
+    attr = CompressedAttribute(use_zstd=True)
+    texts = [f"thread {i} " * 500 for i in range(8)]
+
+    def roundtrip(text):
+        return all(attr.deserialize(attr.serialize(text)) == text for _ in range(50))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(roundtrip, texts))
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"wbits": -15}, {"use_zstd": True}])
+def test_compressed_reads_legacy_base64(kwargs):
+    if kwargs.get("use_zstd"):
+        pytest.importorskip("zstandard")
+    text = "hello world " * 100
+    legacy = base64.b64encode(zlib.compress(text.encode("utf-8")))
+    assert CompressedAttribute(**kwargs).deserialize(legacy) == text
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        datetime(2021, 5, 4, 3, 2, 1, 123456, tzinfo=timezone.utc),
+        datetime(2021, 5, 4, 3, 2, 1, tzinfo=timezone(timedelta(hours=-7))),
+        datetime(2021, 5, 4, 3, 2, 1, tzinfo=timezone(timedelta(hours=1, seconds=15))),
+    ],
+)
+def test_iso_datetime_roundtrip(value):
+    attr = IsoDateTime()
+    assert attr.deserialize(attr.serialize(value)) == value
+
+
+def test_iso_datetime_falls_back_when_ciso8601_rejects():
+    ciso8601 = pytest.importorskip("ciso8601")
+    value = datetime(2021, 5, 4, 3, 2, 1, tzinfo=timezone(timedelta(hours=1, seconds=15)))
+    stored = value.isoformat()
+    with pytest.raises(ValueError):
+        ciso8601.parse_datetime(stored)
+    parsed = IsoDateTime().deserialize(stored)
+    assert parsed == value
+    assert parsed.utcoffset() == timedelta(hours=1, seconds=15)
+
+
+@pytest.mark.parametrize(
+    "stored, expected",
+    [("42", 42), ("-7", -7), ("1.5", 1), ("1e3", 1000)],
+)
+def test_copied_integer_deserialize(stored, expected):
+    attr = CopiedIntegerAttribute(source="stars")
+    assert attr.deserialize(stored) == expected
+    assert attr.deserialize(attr.serialize(expected)) == expected
+
+
+def test_copied_integer_serializes_ulid():
+    f = models.Review(
+        app="Annoyed Birds",
+        stars=5,
+        reviewer_email="someone@test.com",
+        reviewer_name="Some One",
+    )
+    stored = f.serialize()["gsi2_sk"]["N"]
+    assert stored == str(int(f.ulid))
+    assert models.Review.gsi2_sk.deserialize(stored) == int(f.ulid)
+
+
 def test_created_at():
     f = models.FooModel(foo="hello")
     now = datetime.now(tz=timezone.utc)
@@ -97,23 +221,24 @@ def test_date_formats():
         iso_dt = pynamodb_polymorph.IsoDateTime()
         iso_now_fmt = iso_dt.serialize(now)"""
     )
-    RUNS = 10000
-    pdb_serialize = timeit.timeit("dt.serialize(now)", setup=setup, number=RUNS)
-    iso_serialize = timeit.timeit("iso_dt.serialize(now)", setup=setup, number=RUNS)
-    pdb_deserialize = timeit.timeit(
-        "dt.deserialize(utc_now_fmt)", setup=setup, number=RUNS
-    )
-    iso_deserialize = timeit.timeit(
-        "iso_dt.deserialize(iso_now_fmt)", setup=setup, number=RUNS
-    )
-    print("Average per loop serialize", pdb_serialize / RUNS)
-    print("Average per loop deserialize", pdb_deserialize / RUNS)
-    print("Average per iso loop serialize", iso_serialize / RUNS)
-    print("Average per iso loop deserialize", iso_deserialize / RUNS)
+    RUNS = 2000
+
+    def per_loop(stmt):
+        # The fastest of a few short repeats is less noisy than one long run
+        return min(timeit.repeat(stmt, setup=setup, number=RUNS, repeat=3)) / RUNS
+
+    pdb_serialize = per_loop("dt.serialize(now)")
+    iso_serialize = per_loop("iso_dt.serialize(now)")
+    pdb_deserialize = per_loop("dt.deserialize(utc_now_fmt)")
+    iso_deserialize = per_loop("iso_dt.deserialize(iso_now_fmt)")
+    print("Average per loop serialize", pdb_serialize)
+    print("Average per loop deserialize", pdb_deserialize)
+    print("Average per iso loop serialize", iso_serialize)
+    print("Average per iso loop deserialize", iso_deserialize)
 
-    assert (iso_serialize / RUNS) * 3 < (
-        pdb_serialize / RUNS
+    assert (
+        iso_serialize * 3 < pdb_serialize
     ), "our custom ISO-based serialization is at least 3x faster than pynamodb's UTCDateTime attribute"
-    assert (iso_deserialize / RUNS) * 3 < (
-        pdb_deserialize / RUNS
+    assert (
+        iso_deserialize * 3 < pdb_deserialize
     ), "our custom ISO-based deserialization is at least 3x faster than pynamodb's UTCDateTime attribute"